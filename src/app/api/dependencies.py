@@ -1,9 +1,18 @@
+from functools import lru_cache
+
 from fastapi import Request
 
+from ..core.config import settings
+
+
+@lru_cache(maxsize=32)
+def _build_base_url(scheme: str, netloc: str) -> str:
+    return f"{scheme}://{netloc}"
+
 
 def get_base_url(request: Request) -> str:
     """
-    Get the base URL from the request.
+    Get the base URL, preferring the configured BASE_URL over the request.
 
     Args:
         request: FastAPI request object
@@ -11,4 +20,8 @@ def get_base_url(request: Request) -> str:
     Returns:
         str: Base URL (e.g., "http://localhost:8000")
     """
-    return f"{request.url.scheme}://{request.url.netloc}"
+    if settings.BASE_URL:
+        return settings.BASE_URL
+
+    url = request.url
+    return _build_base_url(url.scheme, url.netloc)
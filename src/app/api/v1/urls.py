@@ -7,9 +7,13 @@ from ...schemas.url import URLShortenRequest, URLShortenResponse, URLStatsRespon
 from ...services.url_service import URLService
 from ...api.dependencies import get_base_url
 from ...decorators.log_stats import log_url_visit
+from ...core.config import settings
 
 router = APIRouter()
 
+# Short codes never change target, so redirects can be cached by browsers and CDNs
+_REDIRECT_HEADERS = {"Cache-Control": f"public, max-age={settings.REDIRECT_CACHE_MAX_AGE}"}
+
 
 @router.post("/shorten", response_model=URLShortenResponse, status_code=201)
 async def shorten_url(
@@ -28,11 +32,8 @@ async def shorten_url(
     Returns:
         URLShortenResponse: The created short URL information
     """
-    # Convert HttpUrl to string
-    original_url = str(url_data.long_url)
-
     # Create short URL
-    url = await URLService.create_short_url(db, original_url)
+    url = await URLService.create_short_url(db, url_data.long_url)
 
     # Build response
     base_url = get_base_url(request)
@@ -83,7 +84,12 @@ async def redirect_to_url(
     Redirect to the original URL using the short code.
 
     This endpoint uses the @log_url_visit decorator to automatically
-    log the visit before redirecting.
+    log the visit before redirecting. The resolved URL is stored on
+    request.state.url for the decorator to reuse.
+
+    Redirects are permanent (308) and cacheable for REDIRECT_CACHE_MAX_AGE
+    seconds, so repeat visits served from a browser or CDN cache don't
+    reach this endpoint and aren't logged.
 
     Args:
         short_code: The short code to redirect
@@ -96,9 +102,12 @@ async def redirect_to_url(
     Raises:
         HTTPException: If the short code is not found
     """
-    url = await URLService.get_url_by_short_code(db, short_code)
+    url = await URLService.get_redirect_target(db, short_code)
 
     if not url:
         raise HTTPException(status_code=404, detail="Short code not found")
 
-    return RedirectResponse(url=url.original_url, status_code=307)
+    # Expose the resolved URL to @log_url_visit so it doesn't look it up again
+    request.state.url = url
+
+    return RedirectResponse(url=url.original_url, status_code=308, headers=_REDIRECT_HEADERS)
@@ -0,0 +1,11 @@
+from cachetools import TTLCache
+
+from ..core.config import settings
+
+
+# In-process cache for short_code -> (id, original_url) lookups.
+# Short codes are immutable once created, so entries only expire by TTL/LRU.
+url_cache: TTLCache = TTLCache(
+    maxsize=settings.URL_CACHE_MAXSIZE,
+    ttl=settings.URL_CACHE_TTL,
+)
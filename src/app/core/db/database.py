@@ -1,25 +1,85 @@
+import logging
+from functools import wraps
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from ...core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     """Base class for all database models"""
     pass
 
 
+def _pool_limits() -> tuple[int, int]:
+    """
+    Clamp the configured pool to this worker's share of the database's
+    max_connections, so N workers can't open more connections than
+    Postgres allows.
+
+    Returns:
+        tuple[int, int]: pool_size and max_overflow for this worker
+    """
+    available = settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS
+    budget = max(1, available // max(1, settings.WEB_CONCURRENCY))
+
+    pool_size = min(settings.DB_POOL_SIZE, budget)
+    max_overflow = min(settings.DB_MAX_OVERFLOW, budget - pool_size)
+    return pool_size, max_overflow
+
+
+POOL_SIZE, MAX_OVERFLOW = _pool_limits()
+
 # Create async engine with connection pooling
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
     pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_recycle=settings.DB_POOL_RECYCLE,
-    pool_pre_ping=True,  # Verify connections before using
+    pool_pre_ping=settings.DB_POOL_PRE_PING,  # Verify connections before using
 )
 
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _log_disconnect(context) -> None:
+    """
+    Log dropped database connections. SQLAlchemy itself invalidates the
+    connection and the rest of the pool; this hook only records it.
+    """
+    if context.is_disconnect:
+        logger.warning("Database connection lost: %s", context.original_exception)
+
+
+def retry_on_disconnect(func):
+    """
+    Retry a read-only database call once if its connection was dropped.
+
+    This replaces pool_pre_ping's round-trip on every checkout with a
+    retry on the rare stale connection. Only use it on idempotent calls
+    taking the session as `db`.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except DBAPIError as e:
+            if not e.connection_invalidated:
+                raise
+
+            db = kwargs["db"] if "db" in kwargs else args[0]
+            await db.rollback()
+            return await func(*args, **kwargs)
+
+    return wrapper
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
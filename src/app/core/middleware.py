@@ -0,0 +1,28 @@
+import re
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# JSON API paths that need CORS; short code redirects (/{short_code}) are
+# reached by browser navigation and are left out
+API_PATH_REGEX = r"^/(shorten|health|openapi\.json|[^/]+/stats)?$"
+
+
+class PathCORSMiddleware(CORSMiddleware):
+    """
+    CORS middleware applied only to paths matching `path_regex`.
+
+    Other requests, such as short code redirects reached by browser
+    navigation, are passed straight to the app without CORS handling.
+    """
+
+    def __init__(self, app: ASGIApp, path_regex: str, **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        self.path_regex = re.compile(path_regex)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not self.path_regex.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
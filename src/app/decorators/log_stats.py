@@ -1,7 +1,18 @@
+import asyncio
+import logging
 from functools import wraps
 from fastapi import Request
 
-from ..services.url_service import URLService
+from ..services.visit_writer import enqueue_visit
+
+logger = logging.getLogger(__name__)
+
+
+# Single-IP headers set by CDNs and proxies, in priority order:
+# 1. CF-Connecting-IP (Cloudflare)
+# 2. True-Client-IP (Akamai, Cloudflare)
+# 3. X-Real-IP (Nginx proxy)
+_IP_HEADERS = ("CF-Connecting-IP", "True-Client-IP", "X-Real-IP")
 
 
 def get_client_ip(request: Request) -> str:
@@ -16,35 +27,22 @@ def get_client_ip(request: Request) -> str:
         str: Client IP address
     """
     # Priority order for IP extraction:
-    # 1. CF-Connecting-IP (Cloudflare)
-    # 2. True-Client-IP (Akamai, Cloudflare)
-    # 3. X-Real-IP (Nginx proxy)
+    # 1-3. _IP_HEADERS
     # 4. X-Forwarded-For (Standard proxy header)
     # 5. Direct client IP
+    headers = request.headers
 
-    # Cloudflare
-    cf_ip = request.headers.get("CF-Connecting-IP")
-    if cf_ip:
-        return cf_ip
-
-    # Akamai and other CDNs
-    true_client_ip = request.headers.get("True-Client-IP")
-    if true_client_ip:
-        return true_client_ip
-
-    # Nginx and other proxies
-    real_ip = request.headers.get("X-Real-IP")
-    if real_ip:
-        return real_ip
+    for header in _IP_HEADERS:
+        ip = headers.get(header)
+        if ip:
+            return ip
 
     # Standard proxy header (can contain multiple IPs)
-    forwarded = request.headers.get("X-Forwarded-For")
+    forwarded = headers.get("X-Forwarded-For")
     if forwarded:
         # X-Forwarded-For can be: "client, proxy1, proxy2"
         # We want the leftmost (original client) IP
-        ips = [ip.strip() for ip in forwarded.split(",")]
-        if ips:
-            return ips[0]
+        return forwarded.partition(",")[0].strip()
 
     # Fallback to direct client IP
     if request.client:
@@ -60,16 +58,18 @@ def log_url_visit(func):
     Usage:
         @log_url_visit
         async def redirect_endpoint(short_code: str, request: Request, db: AsyncSession):
-            # Your endpoint logic must return the URL object
+            # Your endpoint logic must set request.state.url to the visited URL
             pass
+
+    Visits are queued and written in batches by the background visit
+    writer, so logging never delays the response.
     """
 
     @wraps(func)
     async def wrapper(*args, **kwargs):
         request = kwargs.get('request')
-        db = kwargs.get('db')
 
-        if not all([request, db]):
+        if not request:
             # If required parameters are missing, just call the function
             return await func(*args, **kwargs)
 
@@ -77,15 +77,13 @@ def log_url_visit(func):
 
         result = await func(*args, **kwargs)
 
-        # Log the visit asynchronously (don't block the response)
-        # Extract url_id from the result if it's a RedirectResponse
-        # We need to get the URL object from the endpoint
-        short_code = kwargs.get('short_code')
-        if short_code:
+        # Log the visit using the URL the endpoint already resolved
+        url = getattr(request.state, "url", None)
+        if url:
             try:
-                url = await URLService.get_url_by_short_code(db, short_code)
-                if url:
-                    await URLService.log_visit(db, url.id, client_ip)
+                enqueue_visit(url.id, client_ip)
+            except asyncio.QueueFull:
+                logger.warning("Visit queue is full, dropping visit for url_id=%s", url.id)
             except Exception:
                 # Don't fail the request if logging fails
                 pass
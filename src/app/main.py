@@ -1,25 +1,61 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .core.config import settings
+from .core.middleware import API_PATH_REGEX, PathCORSMiddleware
+from .core.db.database import engine, POOL_SIZE, MAX_OVERFLOW
 from .api.v1 import urls
+from .services.visit_writer import run_visit_writer, stop_visit_writer
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info(
+        "Database pool per worker: pool_size=%d max_overflow=%d (workers=%d)",
+        POOL_SIZE,
+        MAX_OVERFLOW,
+        settings.WEB_CONCURRENCY
+    )
+
+    # Background task that writes queued visits in batches
+    visit_writer = asyncio.create_task(run_visit_writer())
+
+    yield
+
+    # Let the writer finish its current batch and drain the queue
+    stop_visit_writer()
+    await visit_writer
 
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="A minimal URL shortener service",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# CORS decorators
+# CORS for the JSON API only; redirects are reached by browser navigation
+# and never need it
 app.add_middleware(
-    CORSMiddleware,
+    PathCORSMiddleware,
+    path_regex=API_PATH_REGEX,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress JSON responses; small bodies such as redirects are left as is
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
 app.include_router(urls.router, tags=["URLs"])
 
 
@@ -35,3 +71,17 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
+
+
+if settings.DEBUG:
+    # Unauthenticated, so only exposed in debug deployments
+    @app.get("/debug/pool", include_in_schema=False)
+    async def pool_status():
+        pool = engine.pool
+        return {
+            "pool_size": POOL_SIZE,
+            "max_overflow": MAX_OVERFLOW,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow()
+        }
@@ -19,19 +19,27 @@ class URL(Base):
         server_default=func.now(),
         nullable=False
     )
+    # Denormalized visit counter, maintained by the visit writer
+    visit_count: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default="0",
+        nullable=False
+    )
 
-    # Relationship to visits
+    # Relationship to visits; never loaded implicitly since a URL can have
+    # an unbounded number of them (deletes are cascaded by the database)
     visits: Mapped[list["URLVisit"]] = relationship(
         "URLVisit",
         back_populates="url",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy="raise"
     )
 
-    # Add index for better query performance
-    __table_args__ = (
-        Index('ix_urls_short_code', 'short_code'),
-    )
+
+# Expression index for "already shortened?" lookups, since original_url
+# is too long to index efficiently as is
+Index('ix_urls_original_url_md5', func.md5(URL.original_url))
 
 
 class URLVisit(Base):
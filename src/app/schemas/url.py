@@ -1,14 +1,30 @@
+import re
 from datetime import datetime
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, Field, field_validator
+
+# Cheap scheme/whitespace/control character check instead of pydantic's
+# full HttpUrl parsing (Postgres can't store NUL in varchar)
+_HTTP_URL_RE = re.compile(
+    r"https?://[^\s\x00-\x1f\x7f/?#]+[^\s\x00-\x1f\x7f]*",
+    re.IGNORECASE
+)
 
 
 class URLShortenRequest(BaseModel):
-    long_url: HttpUrl = Field(
+    long_url: str = Field(
         ...,
+        max_length=2048,
         description="The original URL to shorten",
         examples=["https://www.example.com/long_url/path"]
     )
 
+    @field_validator("long_url")
+    @classmethod
+    def validate_long_url(cls, value: str) -> str:
+        if not _HTTP_URL_RE.fullmatch(value):
+            raise ValueError("URL must be an absolute http or https URL")
+        return value
+
 
 class URLShortenResponse(BaseModel):
 
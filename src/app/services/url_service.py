@@ -1,11 +1,50 @@
 import secrets
-from sqlalchemy import select, func
+from collections import Counter
+from datetime import datetime
+from typing import NamedTuple
+from sqlalchemy import select, insert, update, bindparam, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.cache import url_cache
 from ..core.config import settings
+from ..core.db.database import retry_on_disconnect
 from ..models.url import URL, URLVisit
 
 
+# Short code alphabet, resolved once instead of per generated character
+_CHARSET = settings.SHORT_CODE_CHARSET
+_CHARSET_LEN = len(_CHARSET)
+_SHORT_CODE_LENGTH = settings.SHORT_CODE_LENGTH
+# Codes can't grow past the urls.short_code column size
+_MAX_SHORT_CODE_LENGTH = URL.__table__.c.short_code.type.length
+# Largest multiple of the charset size that fits in a byte; random bytes
+# at or above it are rejected so every character is equally likely
+_BYTE_LIMIT = 256 - 256 % _CHARSET_LEN
+
+# Short code lookup built once at import; per-call values are bound as
+# parameters so the statement isn't rebuilt on every request and always
+# hits SQLAlchemy's compiled statement cache
+_URL_BY_SHORT_CODE = (
+    select(URL)
+    .where(URL.short_code == bindparam("short_code"))
+    .limit(1)
+)
+# Redirects only need the id and target, so skip loading the full entity
+_REDIRECT_TARGET_BY_SHORT_CODE = (
+    select(URL.id, URL.original_url)
+    .where(URL.short_code == bindparam("short_code"))
+    .limit(1)
+)
+
+
+class RedirectTarget(NamedTuple):
+    """Minimal URL data needed to serve a redirect"""
+
+    id: int
+    original_url: str
+
+
 class URLService:
     """Service for URL shortening operations"""
 
@@ -21,10 +60,16 @@ class URLService:
             str: Random short code
         """
         if length is None:
-            length = settings.SHORT_CODE_LENGTH
-
-        charset = settings.SHORT_CODE_CHARSET
-        return ''.join(secrets.choice(charset) for _ in range(length))
+            length = _SHORT_CODE_LENGTH
+
+        code = ''
+        while len(code) < length:
+            code += ''.join(
+                _CHARSET[b % _CHARSET_LEN]
+                for b in secrets.token_bytes(length)
+                if b < _BYTE_LIMIT
+            )
+        return code[:length]
 
     @staticmethod
     async def create_short_url(db: AsyncSession, original_url: str) -> URL:
@@ -38,76 +83,87 @@ class URLService:
         Returns:
             URL: The created URL object
         """
-        # Check if URL already exists
+        # Check if URL already exists, using the md5 expression index
         result = await db.execute(
-            select(URL).where(URL.original_url == original_url).limit(1)
+            select(URL)
+            .where(
+                func.md5(URL.original_url) == func.md5(original_url),
+                URL.original_url == original_url
+            )
+            .limit(1)
         )
         existing_url = result.scalar_one_or_none()
 
         if existing_url:
             return existing_url
 
-        # Generate unique short code with retry mechanism
-        short_code = await URLService._generate_unique_short_code(db)
-
-        # Create new URL
-        url = URL(
-            original_url=original_url,
-            short_code=short_code
-        )
-        db.add(url)
+        # Insert with a unique short code, retrying on collisions
+        url = await URLService._insert_with_unique_short_code(db, original_url)
         await db.commit()
-        await db.refresh(url)
+
+        # Drop any stale cache entry for a reused short code
+        url_cache.pop(url.short_code, None)
 
         return url
 
     @staticmethod
-    async def _generate_unique_short_code(
+    async def _insert_with_unique_short_code(
         db: AsyncSession,
+        original_url: str,
         max_attempts: int = 10,
         initial_length: int = None
-    ) -> str:
+    ) -> URL:
         """
-        Generate a unique short code that doesn't exist in the database.
+        Insert a URL with a random short code, relying on the unique index
+        to detect collisions instead of checking for the code up front.
 
         Args:
             db: Database session
+            original_url: The original URL to shorten
             max_attempts: Maximum number of attempts to find a unique code
             initial_length: Initial length of the short code (uses settings default if None)
 
         Returns:
-            str: A unique short code
+            URL: The inserted URL object
 
         Raises:
-            Exception: If unable to generate a unique code after max_attempts
+            RuntimeError: If unable to insert a unique code after max_attempts
         """
         if initial_length is None:
-            initial_length = settings.SHORT_CODE_LENGTH
+            initial_length = _SHORT_CODE_LENGTH
 
-        length = initial_length
+        length = min(initial_length, _MAX_SHORT_CODE_LENGTH)
 
         # Try generating codes with increasing length if needed
-        for attempt in range(max_attempts):
+        for attempt in range(max_attempts + 1):
+            if attempt == max_attempts:
+                # Last resort: try a much longer code
+                # This should virtually never happen with proper settings
+                length = min(length + 4, _MAX_SHORT_CODE_LENGTH)
+
             short_code = URLService.generate_short_code(length=length)
 
-            # Check if short code already exists
+            # Nothing is returned if the short code is already taken
             result = await db.execute(
-                select(URL).where(URL.short_code == short_code).limit(1)
+                pg_insert(URL)
+                .values(original_url=original_url, short_code=short_code)
+                .on_conflict_do_nothing(index_elements=[URL.short_code])
+                .returning(URL)
             )
+            url = result.scalar_one_or_none()
 
-            if result.scalar_one_or_none() is None:
+            if url is not None:
                 # Found a unique code!
-                return short_code
+                return url
 
             # After half the attempts, increase the length to reduce collisions
             if attempt == max_attempts // 2:
-                length += 2
+                length = min(length + 2, _MAX_SHORT_CODE_LENGTH)
 
-        # Last resort: generate a much longer code
-        # This should virtually never happen with proper settings
-        return URLService.generate_short_code(length=length + 4)
+        raise RuntimeError("Unable to generate a unique short code")
 
     @staticmethod
+    @retry_on_disconnect
     async def get_url_by_short_code(db: AsyncSession, short_code: str) -> URL | None:
         """
         Get URL by short code.
@@ -119,26 +175,64 @@ class URLService:
         Returns:
             URL | None: The URL object or None if not found
         """
+        result = await db.execute(_URL_BY_SHORT_CODE, {"short_code": short_code})
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    @retry_on_disconnect
+    async def get_redirect_target(db: AsyncSession, short_code: str) -> RedirectTarget | None:
+        """
+        Get the redirect target for a short code, using the in-process cache.
+
+        Args:
+            db: Database session
+            short_code: The short code to look up
+
+        Returns:
+            RedirectTarget | None: The URL id and original URL or None if not found
+        """
+        target = url_cache.get(short_code)
+        if target is not None:
+            return target
+
         result = await db.execute(
-            select(URL).where(URL.short_code == short_code).limit(1)
+            _REDIRECT_TARGET_BY_SHORT_CODE, {"short_code": short_code}
         )
-        return result.scalar_one_or_none()
+        row = result.one_or_none()
+        if not row:
+            return None
+
+        target = RedirectTarget(*row)
+        url_cache[short_code] = target
+        return target
 
     @staticmethod
-    async def log_visit(db: AsyncSession, url_id: int, visitor_ip: str) -> None:
+    async def log_visits(db: AsyncSession, visits: list[tuple[int, str, datetime]]) -> None:
         """
-        Log a visit to a short URL.
+        Log a batch of visits to short URLs with a single bulk insert
+        and bump each URL's visit counter once per batch.
 
         Args:
             db: Database session
-            url_id: The ID of the URL that was visited
-            visitor_ip: IP address of the visitor
+            visits: (url_id, visitor_ip, visited_at) tuples to insert
         """
-        visit = URLVisit(
-            url_id=url_id,
-            visitor_ip=visitor_ip
+        await db.execute(
+            insert(URLVisit),
+            [
+                {"url_id": url_id, "visitor_ip": visitor_ip, "visited_at": visited_at}
+                for url_id, visitor_ip, visited_at in visits
+            ]
+        )
+
+        # Update counters in id order so concurrent writers lock rows consistently
+        counts = Counter(url_id for url_id, _, _ in visits)
+        urls = URL.__table__
+        await db.execute(
+            update(urls)
+            .where(urls.c.id == bindparam("url_id"))
+            .values(visit_count=urls.c.visit_count + bindparam("visits")),
+            [{"url_id": url_id, "visits": counts[url_id]} for url_id in sorted(counts)]
         )
-        db.add(visit)
         await db.commit()
 
     @staticmethod
@@ -153,21 +247,15 @@ class URLService:
         Returns:
             dict: Statistics including URL info and visit count
         """
-        # Get URL info with visit count in single query
+        # Visit count is denormalized onto the URL row
         url = await URLService.get_url_by_short_code(db=db, short_code=short_code)
 
         if not url:
             return None
 
-        result = await db.execute(
-            select(func.count(URLVisit.id))
-            .where(URLVisit.url_id == url.id)
-        )
-        total_visits = result.scalar() or 0
-
         return {
             "short_code": url.short_code,
             "original_url": url.original_url,
-            "total_visits": total_visits,
+            "total_visits": url.visit_count,
             "created_at": url.created_at
         }
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from ..core.config import settings
+from ..core.db.database import AsyncSessionLocal
+from .url_service import URLService
+
+logger = logging.getLogger(__name__)
+
+# Pending visits as (url_id, visitor_ip, visited_at), written in batches
+# by run_visit_writer() so redirects never wait on the database.
+# VISIT_QUEUE_MAXSIZE is enforced in enqueue_visit() rather than by the
+# queue itself, so the stop sentinel can always be queued.
+visit_queue: asyncio.Queue[tuple[int, str, datetime] | None] = asyncio.Queue()
+
+# Queued by stop_visit_writer() to make the writer drain the queue and exit
+_STOP = None
+
+
+def enqueue_visit(url_id: int, visitor_ip: str) -> None:
+    """
+    Queue a visit for the background writer without blocking.
+
+    Args:
+        url_id: The ID of the URL that was visited
+        visitor_ip: IP address of the visitor
+
+    Raises:
+        asyncio.QueueFull: If the writer has fallen too far behind
+    """
+    if visit_queue.qsize() >= settings.VISIT_QUEUE_MAXSIZE:
+        raise asyncio.QueueFull
+    visit_queue.put_nowait((url_id, visitor_ip, datetime.now(timezone.utc)))
+
+
+def stop_visit_writer() -> None:
+    """Ask run_visit_writer() to write everything queued so far and exit."""
+    visit_queue.put_nowait(_STOP)
+
+
+async def _next_batch() -> tuple[list[tuple[int, str, datetime]], bool]:
+    """
+    Wait for a visit, then collect more until the batch is full or
+    VISIT_BATCH_MS has elapsed.
+
+    Returns:
+        tuple: Batch of queued visits and whether the writer was asked to stop
+    """
+    item = await visit_queue.get()
+    if item is _STOP:
+        return [], True
+    batch = [item]
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.VISIT_BATCH_MS / 1000
+
+    while len(batch) < settings.VISIT_BATCH_SIZE:
+        try:
+            item = visit_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+
+            try:
+                item = await asyncio.wait_for(visit_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+        if item is _STOP:
+            return batch, True
+        batch.append(item)
+
+    return batch, False
+
+
+async def _write_batch(batch: list[tuple[int, str, datetime]]) -> None:
+    """
+    Persist a batch of visits in a single transaction, falling back to
+    one transaction per visit if the batch fails so a single bad row
+    (e.g. a visit to a URL deleted meanwhile) doesn't drop the others.
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            await URLService.log_visits(session, batch)
+        return
+    except Exception:
+        if len(batch) == 1:
+            logger.exception("Failed to write visit for url_id=%s", batch[0][0])
+            return
+        logger.warning(
+            "Failed to write batch of %d visits, retrying one by one",
+            len(batch),
+            exc_info=True
+        )
+
+    # Don't let a failed batch stop the writer
+    try:
+        async with AsyncSessionLocal() as session:
+            for visit in batch:
+                try:
+                    await URLService.log_visits(session, [visit])
+                except Exception:
+                    await session.rollback()
+                    logger.exception("Failed to write visit for url_id=%s", visit[0])
+    except Exception:
+        logger.exception("Failed to write %d visits", len(batch))
+
+
+async def run_visit_writer() -> None:
+    """
+    Consume the visit queue, writing visits in batches, until
+    stop_visit_writer() is called. The batch in progress and anything
+    still queued are written before returning.
+    """
+    stopping = False
+    while not stopping:
+        batch, stopping = await _next_batch()
+        if batch:
+            await _write_batch(batch)
+
+    await flush_visits()
+
+
+async def flush_visits() -> None:
+    """Write any visits still queued, e.g. on shutdown."""
+    while not visit_queue.empty():
+        batch = []
+        while len(batch) < settings.VISIT_BATCH_SIZE and not visit_queue.empty():
+            item = visit_queue.get_nowait()
+            if item is not _STOP:
+                batch.append(item)
+        if batch:
+            await _write_batch(batch)
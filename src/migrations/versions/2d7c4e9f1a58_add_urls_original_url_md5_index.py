@@ -0,0 +1,24 @@
+"""Add md5 expression index on urls.original_url
+
+Revision ID: 2d7c4e9f1a58
+Revises: 8b3e5d0a6c21
+Create Date: 2026-10-15 11:38:05.627140
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7c4e9f1a58'
+down_revision = '8b3e5d0a6c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_urls_original_url_md5', 'urls', [sa.text('md5(original_url)')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_urls_original_url_md5', table_name='urls')
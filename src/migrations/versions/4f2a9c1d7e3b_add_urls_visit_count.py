@@ -0,0 +1,29 @@
+"""Add urls.visit_count
+
+Revision ID: 4f2a9c1d7e3b
+Revises: c6cfb87d7ecb
+Create Date: 2026-10-15 10:12:31.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2a9c1d7e3b'
+down_revision = 'c6cfb87d7ecb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('urls', sa.Column('visit_count', sa.BigInteger(), server_default='0', nullable=False))
+    # Backfill counters from existing visits
+    op.execute(
+        "UPDATE urls SET visit_count = "
+        "(SELECT count(*) FROM url_visits WHERE url_visits.url_id = urls.id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('urls', 'visit_count')
@@ -0,0 +1,27 @@
+"""Make ix_urls_short_code unique
+
+Revision ID: 8b3e5d0a6c21
+Revises: 4f2a9c1d7e3b
+Create Date: 2026-10-15 11:02:47.093318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b3e5d0a6c21'
+down_revision = '4f2a9c1d7e3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # INSERT ... ON CONFLICT (short_code) needs a unique index to infer
+    op.drop_index('ix_urls_short_code', table_name='urls')
+    op.create_index(op.f('ix_urls_short_code'), 'urls', ['short_code'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_urls_short_code'), table_name='urls')
+    op.create_index('ix_urls_short_code', 'urls', ['short_code'], unique=False)
@@ -0,0 +1,45 @@
+import asyncio
+import logging
+
+from starlette.requests import Request
+
+from src.app.core.config import settings
+from src.app.decorators import log_stats
+from src.app.services import visit_writer
+from src.app.services.url_service import RedirectTarget
+
+
+def make_request() -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(b"x-forwarded-for", b"203.0.113.7, 10.0.0.1")],
+        "client": ("10.0.0.1", 1234),
+    })
+
+
+@log_stats.log_url_visit
+async def redirect(short_code: str, request: Request):
+    request.state.url = RedirectTarget(id=42, original_url="https://example.com")
+    return "redirected"
+
+
+async def test_log_url_visit_queues_visit(monkeypatch):
+    monkeypatch.setattr(visit_writer, "visit_queue", asyncio.Queue())
+
+    result = await redirect(short_code="abc123", request=make_request())
+
+    url_id, visitor_ip, _ = visit_writer.visit_queue.get_nowait()
+    assert result == "redirected"
+    assert (url_id, visitor_ip) == (42, "203.0.113.7")
+
+
+async def test_log_url_visit_warns_when_queue_is_full(monkeypatch, caplog):
+    monkeypatch.setattr(visit_writer, "visit_queue", asyncio.Queue())
+    monkeypatch.setattr(settings, "VISIT_QUEUE_MAXSIZE", 0)
+
+    with caplog.at_level(logging.WARNING, logger=log_stats.__name__):
+        result = await redirect(short_code="abc123", request=make_request())
+
+    assert result == "redirected"
+    assert visit_writer.visit_queue.empty()
+    assert "dropping visit for url_id=42" in caplog.text
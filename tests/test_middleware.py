@@ -0,0 +1,50 @@
+import httpx
+import pytest
+
+from src.app.main import app
+
+ORIGIN = {"Origin": "https://app.example.com"}
+PREFLIGHT = {**ORIGIN, "Access-Control-Request-Method": "GET"}
+
+
+def client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.parametrize("path", [
+    "/",
+    "/shorten",
+    "/health",
+    "/openapi.json",
+    "/abc123/stats",
+])
+async def test_cors_preflight_handled_for_api_paths(path):
+    async with client() as c:
+        response = await c.options(path, headers=PREFLIGHT)
+
+    assert response.status_code == 200
+    assert "access-control-allow-methods" in response.headers
+
+
+async def test_cors_headers_added_to_api_responses():
+    async with client() as c:
+        response = await c.get("/openapi.json", headers=ORIGIN)
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+async def test_cors_skipped_for_debug_paths():
+    async with client() as c:
+        response = await c.options("/debug/pool", headers=PREFLIGHT)
+
+    assert "access-control-allow-methods" not in response.headers
+
+
+async def test_cors_skipped_for_redirect_paths():
+    async with client() as c:
+        response = await c.options("/abc123", headers=PREFLIGHT)
+
+    # Not handled as a preflight, so the GET-only redirect route rejects it
+    assert response.status_code == 405
+    assert "access-control-allow-methods" not in response.headers
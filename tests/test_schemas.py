@@ -0,0 +1,32 @@
+import pytest
+from pydantic import ValidationError
+
+from src.app.schemas.url import URLShortenRequest
+
+
+@pytest.mark.parametrize("long_url", [
+    "https://www.example.com/long_url/path",
+    "http://example.com",
+    "HTTPS://example.com/search?q=a&b=c#top",
+])
+def test_long_url_accepts_http_urls(long_url):
+    assert URLShortenRequest(long_url=long_url).long_url == long_url
+
+
+@pytest.mark.parametrize("long_url", [
+    "ftp://example.com/file",
+    "example.com",
+    "https://",
+    "https:///path",
+    "https://exa mple.com",
+    "http://example.com/a b",
+    "http://example.com\n",
+    "http://a\x00b",
+    "http://a\x01b",
+    "http://example.com/\x7f",
+    " http://example.com",
+    "https://example.com/" + "a" * 2048,
+])
+def test_long_url_rejects_invalid_urls(long_url):
+    with pytest.raises(ValidationError):
+        URLShortenRequest(long_url=long_url)
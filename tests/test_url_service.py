@@ -0,0 +1,62 @@
+from collections import Counter
+
+import pytest
+from pydantic import ValidationError
+
+from src.app.core.config import Settings, settings
+from src.app.services.url_service import URLService
+
+
+class _NoRowResult:
+    def scalar_one_or_none(self):
+        return None
+
+
+class _AlwaysConflictingSession:
+    """Session stub whose ON CONFLICT inserts never return a row."""
+
+    def __init__(self):
+        self.short_codes = []
+
+    async def execute(self, statement):
+        self.short_codes.append(statement.compile().params["short_code"])
+        return _NoRowResult()
+
+
+async def test_insert_gives_up_without_exceeding_column_size():
+    db = _AlwaysConflictingSession()
+
+    with pytest.raises(RuntimeError):
+        await URLService._insert_with_unique_short_code(db, "https://example.com")
+
+    assert len(db.short_codes) == 11
+    assert max(len(code) for code in db.short_codes) == 10
+
+
+def test_generate_short_code_uses_default_length_and_charset():
+    code = URLService.generate_short_code()
+
+    assert len(code) == settings.SHORT_CODE_LENGTH
+    assert set(code) <= set(settings.SHORT_CODE_CHARSET)
+
+
+@pytest.mark.parametrize("length", [1, 8, 10, 64])
+def test_generate_short_code_respects_length(length):
+    assert len(URLService.generate_short_code(length=length)) == length
+
+
+def test_generate_short_code_covers_whole_charset_evenly():
+    counts = Counter(''.join(URLService.generate_short_code() for _ in range(50000)))
+
+    # 300000 characters over 62 symbols is ~4840 each, so an unbiased draw
+    # stays around a 1.07 max/min ratio. Plain b % 62 would map 5 of the
+    # 256 byte values to each of the first 8 symbols and 4 to the rest,
+    # making those symbols ~25% more likely
+    assert set(counts) == set(settings.SHORT_CODE_CHARSET)
+    assert max(counts.values()) / min(counts.values()) < 1.15
+
+
+@pytest.mark.parametrize("charset", ["", "a" * 257])
+def test_settings_reject_unusable_short_code_charset(charset):
+    with pytest.raises(ValidationError):
+        Settings(SHORT_CODE_CHARSET=charset)
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from src.app.core.config import settings
+from src.app.services import visit_writer
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Use a fresh queue per test and record batches instead of writing them."""
+    monkeypatch.setattr(visit_writer, "visit_queue", asyncio.Queue())
+
+    batches = []
+
+    async def fake_write_batch(batch):
+        batches.append(list(batch))
+
+    monkeypatch.setattr(visit_writer, "_write_batch", fake_write_batch)
+    return batches
+
+
+async def test_next_batch_stops_at_batch_size(written, monkeypatch):
+    monkeypatch.setattr(settings, "VISIT_BATCH_SIZE", 3)
+    for url_id in range(5):
+        visit_writer.enqueue_visit(url_id, "127.0.0.1")
+
+    batch, stopping = await visit_writer._next_batch()
+
+    assert [visit[0] for visit in batch] == [0, 1, 2]
+    assert not stopping
+
+
+async def test_next_batch_waits_at_most_batch_ms(written, monkeypatch):
+    monkeypatch.setattr(settings, "VISIT_BATCH_MS", 20)
+    visit_writer.enqueue_visit(1, "127.0.0.1")
+
+    batch, stopping = await asyncio.wait_for(visit_writer._next_batch(), timeout=1)
+
+    assert len(batch) == 1
+    assert not stopping
+
+
+async def test_enqueue_visit_raises_when_queue_is_full(written, monkeypatch):
+    monkeypatch.setattr(settings, "VISIT_QUEUE_MAXSIZE", 2)
+    visit_writer.enqueue_visit(1, "127.0.0.1")
+    visit_writer.enqueue_visit(2, "127.0.0.1")
+
+    with pytest.raises(asyncio.QueueFull):
+        visit_writer.enqueue_visit(3, "127.0.0.1")
+
+
+async def test_stop_writes_batch_in_progress_and_queued_visits(written, monkeypatch):
+    monkeypatch.setattr(settings, "VISIT_BATCH_SIZE", 100)
+    monkeypatch.setattr(settings, "VISIT_BATCH_MS", 1000)
+
+    writer = asyncio.create_task(visit_writer.run_visit_writer())
+    for url_id in range(5):
+        visit_writer.enqueue_visit(url_id, "127.0.0.1")
+
+    # Stop while the writer is still waiting to fill its batch
+    await asyncio.sleep(0.01)
+    visit_writer.stop_visit_writer()
+    await asyncio.wait_for(writer, timeout=1)
+
+    assert sorted(visit[0] for batch in written for visit in batch) == [0, 1, 2, 3, 4]
+
+
+async def test_flush_visits_writes_remaining_visits(written, monkeypatch):
+    monkeypatch.setattr(settings, "VISIT_BATCH_SIZE", 2)
+    for url_id in range(3):
+        visit_writer.enqueue_visit(url_id, "127.0.0.1")
+    visit_writer.stop_visit_writer()
+
+    await visit_writer.flush_visits()
+
+    assert [[visit[0] for visit in batch] for batch in written] == [[0, 1], [2]]
+    assert visit_writer.visit_queue.empty()
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def rollback(self):
+        pass
+
+
+async def test_write_batch_falls_back_to_one_visit_per_transaction(monkeypatch):
+    attempts = []
+
+    async def fake_log_visits(db, visits):
+        attempts.append([visit[0] for visit in visits])
+        if any(url_id == 2 for url_id, _, _ in visits):
+            raise ValueError("url 2 was deleted")
+
+    monkeypatch.setattr(visit_writer, "AsyncSessionLocal", _FakeSession)
+    monkeypatch.setattr(visit_writer.URLService, "log_visits", fake_log_visits)
+
+    await visit_writer._write_batch([(1, "a", None), (2, "b", None), (3, "c", None)])
+
+    assert attempts == [[1, 2, 3], [1], [2], [3]]